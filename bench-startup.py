@@ -0,0 +1,83 @@
+import argparse
+import importlib
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from link_checker import collector
+
+
+def cold_start(cmd, runs):
+    "Run the command in a new interpreter `runs` times, return durations."
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def unpickle_only(target_func):
+    """Process target taking obtainer's function as argument, so the process
+    imports the obtainer module like a real one does, but makes no requests.
+    """
+    return os.getpid()
+
+
+def start_latency(method, preload):
+    "Start the worker template, return duration including the first process."
+    start = time.perf_counter()
+    collector.preload_workers(preload, method)
+    collector.func_proc(os.getpid, 30)
+    return time.perf_counter() - start
+
+
+def spawn_latency(runs, target_func):
+    "Start `runs` obtainer-like processes by `func_proc`, return durations."
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        collector.func_proc(unpickle_only, 30, target_func)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def report(name, durations):
+    print(
+        f"{name}: median {statistics.median(durations) * 1000:.1f}ms,"
+        f" max {max(durations) * 1000:.1f}ms, runs {len(durations)}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", "-n", type=int, help="Runs per case", default=20)
+    parser.add_argument(
+        "--obtainer",
+        type=str,
+        help="Obtainer module preloaded into forkserver",
+        default="link_checker.obtainers.pyppeteer",
+    )
+    args = parser.parse_args()
+
+    cli = os.path.join(os.path.dirname(os.path.abspath(__file__)), "collector-cli.py")
+    report(
+        "import link_checker",
+        cold_start([sys.executable, "-c", "import link_checker"], args.runs),
+    )
+    report(
+        "collector-cli.py --version",
+        cold_start([sys.executable, cli, "--version"], args.runs),
+    )
+
+    # Import the obtainer in this process as the CLI does, so `fork` processes
+    # inherit it and `spawn` ones import it again.
+    obtainer = importlib.import_module(args.obtainer)
+    preload = ["link_checker.collector", args.obtainer]
+    for method in ("spawn", "fork", "forkserver"):
+        started = start_latency(method, preload)
+        if method == "forkserver":
+            print(f"forkserver start: {started * 1000:.1f}ms")
+        report(f"worker spawn ({method})", spawn_latency(args.runs, obtainer.get_links))
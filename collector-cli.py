@@ -1,4 +1,5 @@
 import argparse
+import multiprocessing
 
 import link_checker
 
@@ -11,10 +12,15 @@ if __name__ == "__main__":
     parser.add_argument("--version", "-v", action="version", version=version)
     parser.add_argument(
         "url",
-        nargs=1,
+        nargs="?",
         type=str,
         help="URL to the target web-site (http://example.com')",
     )
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="Create database tables and exit",
+    )
     parser.add_argument(
         "--concurrency", "-c", type=int, help="Number of concurrent requests", default=1
     )
@@ -34,15 +40,65 @@ if __name__ == "__main__":
         default="sitemap.xml",
     )
 
+    parser.add_argument(
+        "--memory_limit",
+        type=int,
+        help="Collector RSS in megabytes triggering one-time spill of queues to disk",
+        default=None,
+    )
+    parser.add_argument(
+        "--history_memory_size",
+        type=int,
+        help="Number of visited URLs kept in memory before spilling to disk",
+        default=1000000,
+    )
+    parser.add_argument(
+        "--frontier_memory_size",
+        type=int,
+        help="Number of queued URLs kept in memory before spilling to disk",
+        default=100000,
+    )
+    parser.add_argument(
+        "--memory_limited_size",
+        type=int,
+        help="Number of URLs of each queue kept in memory after memory limit spill",
+        default=1000,
+    )
+    parser.add_argument(
+        "--spill_dir",
+        type=str,
+        help="Directory for spill files, system temporary directory by default",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--worker_start_method",
+        type=str,
+        choices=multiprocessing.get_all_start_methods(),
+        help="Start method of obtainer processes, platform dependent by default",
+        default=None,
+    )
+
     args = parser.parse_args()
+    if args.migrate:
+        link_checker.models.migrate()
+        exit(0)
+
     if not args.url:
         parser.print_help()
         exit(1)
 
-    collector = link_checker.collector.Collector(args.url[0])
+    collector = link_checker.collector.Collector(args.url)
     collector.useragent = args.useragent
     collector.concurrency = args.concurrency
     collector.max_duration = args.max_duration
     collector.sitemapFile = args.sitemap
+    collector.memory_limit = args.memory_limit
+    collector.history_memory_size = args.history_memory_size
+    collector.frontier_memory_size = args.frontier_memory_size
+    collector.memory_limited_size = args.memory_limited_size
+    collector.spill_dir = args.spill_dir
+    if args.worker_start_method:
+        collector.worker_start_method = args.worker_start_method
     collector.obtainer = link_checker.obtainers.pyppeteer
     collector.start()
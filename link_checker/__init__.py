@@ -1,3 +1,11 @@
-from . import collector
-from . import models
-from . import web_access
\ No newline at end of file
+import importlib
+
+# Submodules are imported on first access, so `import link_checker` does not
+# pull in aiohttp, peewee, psutil and pyppeteer.
+_submodules = {"collector", "config", "frontier", "models", "obtainers", "web_access"}
+
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,14 +3,14 @@ import concurrent.futures
 import datetime
 import logging
 import multiprocessing
+import multiprocessing.forkserver
 import os
 import signal
 import sys
 
 import psutil
-import urllib3
 
-from . import config, models
+from . import config, frontier, models
 
 logging.basicConfig(level=logging.INFO)
 logging.getLogger("peewee").setLevel(logging.CRITICAL)
@@ -20,12 +20,23 @@ logging.getLogger("urllib3").setLevel(logging.CRITICAL)
 logging.getLogger("pyppeteer").setLevel(logging.CRITICAL)
 logging.getLogger("asyncio").setLevel(logging.CRITICAL)
 
-# Disable `InsecureRequestWarning: Unverified HTTPS request is being made.`
-# log warnings.
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
 log = logging.getLogger(__name__)
 
+# Start method of obtainer processes. Plain `fork` is the fastest, it is used
+# wherever it is available except macOS, where it is unsafe (Python 3.14 makes
+# `forkserver` the default on Linux too, so it is chosen explicitly). Otherwise
+# obtainer processes are forked from a forkserver with obtainer modules already
+# imported, instead of re-importing them in every process with `spawn`.
+_start_methods = multiprocessing.get_all_start_methods()
+if "fork" in _start_methods and sys.platform != "darwin":
+    default_start_method = "fork"
+elif "forkserver" in _start_methods:
+    default_start_method = "forkserver"
+else:
+    default_start_method = "spawn"
+
+worker_context = multiprocessing.get_context(default_start_method)
+
 
 class RequestResult:
     url = ""
@@ -40,26 +51,10 @@ class RequestResult:
 
 class MyProcessPoolExecutor(concurrent.futures.ProcessPoolExecutor):
     """Use process pool instad of thread pool, cause `pyppeteer` can be run
-    only in a main thread.
+    only in a main thread. Running requests are counted by `Collector` on the
+    event loop thread.
     """
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._running_workers = 0
-
-    def submit(self, *args, **kwargs):
-        future = super().submit(*args, **kwargs)
-        self._running_workers += 1
-        future.add_done_callback(self._worker_is_done)
-        return future
-
-    # pylint: disable=unused-argument
-    def _worker_is_done(self, future):
-        self._running_workers -= 1
-
-    def get_pool_usage(self):
-        return self._running_workers
-
 
 def reap_process(pid, timeout=1):
     "Tries hard to terminate and ultimately kill all the children of this process."
@@ -95,20 +90,29 @@ def reap_process(pid, timeout=1):
                 log.info("Process {} survived SIGKILL; giving up".format(p))
 
 
-def func_proc_result(target_func, q):
-    """Push function results into queue, queue uses here for cross-process
-    communication.
+def preload_workers(modules, start_method=default_start_method):
+    """Set start method of processes started by `func_proc` in the current
+    process. For `forkserver` also start it with `modules` imported, so the
+    processes do not import them again.
     """
+    global worker_context
+    worker_context = multiprocessing.get_context(start_method)
+    if start_method != "forkserver":
+        return
+    worker_context.set_forkserver_preload(list(modules))
+    multiprocessing.forkserver.ensure_running()
 
-    def wrapper(*args, **kwargs):
-        try:
-            result = target_func(*args, **kwargs)
-            q.put(result)
-        except Exception as e:
-            log.debug("'target_func' call execution exception: %s", e)
-            raise e
 
-    return wrapper
+def func_proc_result(target_func, q, *args, **kwargs):
+    """Push function results into queue, queue uses here for cross-process
+    communication.
+    """
+    try:
+        result = target_func(*args, **kwargs)
+        q.put(result)
+    except Exception as e:
+        log.debug("'target_func' call execution exception: %s", e)
+        raise e
 
 
 def func_proc(_target_func=None, _timeout=30, *args, **kwargs):
@@ -116,12 +120,12 @@ def func_proc(_target_func=None, _timeout=30, *args, **kwargs):
     in timeout time - kill process with all children.
     """
     # Queue uses to get a result from the process.
-    q = multiprocessing.Queue()
+    q = worker_context.Queue()
     try_count = 3
 
     while try_count > 0:
-        p = multiprocessing.Process(
-            target=func_proc_result(_target_func, q), args=args, kwargs=kwargs
+        p = worker_context.Process(
+            target=func_proc_result, args=(_target_func, q) + args, kwargs=kwargs
         )
         p.start()
 
@@ -144,18 +148,30 @@ def func_proc(_target_func=None, _timeout=30, *args, **kwargs):
 
 
 class Collector:
-    # Keep Future(s) of active requests.
-    requests = set()
-
     # sitemapFile
     sitemapFile = "sitemap.xml"
 
-    # Keep history of all visited URLs.
-    history = set()
-
     # How many parallel requests are possible.
     concurrency = 1
 
+    # How many visited URLs keep in memory, the rest of history is moved to
+    # a spill file on disk.
+    history_memory_size = 1000000
+
+    # How many queued URLs keep in memory, the rest of frontier is moved to
+    # a spill file on disk.
+    frontier_memory_size = 100000
+
+    # Directory for spill files, system temporary directory if not set.
+    spill_dir = None
+
+    # Collector process RSS in megabytes triggering a one-time spill: the first
+    # time RSS exceeds it, all in-memory history and frontier are moved to
+    # disk and only `memory_limited_size` items of each are kept in memory for
+    # the rest of the run. RSS is not enforced to stay under it.
+    memory_limit = None
+    memory_limited_size = 1000
+
     # Max request duration, after this period will interpret result as error.
     max_duration = 6
 
@@ -166,21 +182,47 @@ class Collector:
     # the function.
     obtainer = None
 
+    # Start method of obtainer processes, see `preload_workers`.
+    worker_start_method = default_start_method
+
     # How mach time collector will wait obtainer results, it this timeout exceed
     # collector terminates obtainer process.
     obtainer_execution_timeout = 30
 
     def __init__(self, url):
         self.start_url = url
-        self.history = set()
-        self._future_start_time = {}
-        self._features = set()
+        self.history = None
+        self.peak_rss = 0
+        self._frontier = None
+        self._memory_limited = False
+        # Count of submitted and not yet done requests, changed only on the
+        # event loop thread.
+        self._in_flight = 0
 
     def start(self):
         # Open db connection.
         config.db.connect()
 
-        self.executor = MyProcessPoolExecutor(self.concurrency)
+        # Keep history of all visited URLs.
+        self.history = frontier.DiskBackedSet(
+            self.history_memory_size, self.spill_dir
+        )
+        # Keep URLs waiting for a free worker.
+        self._frontier = frontier.DiskBackedQueue(
+            self.frontier_memory_size, self.spill_dir
+        )
+
+        # Each executor process sets obtainer processes start method, for
+        # `forkserver` it starts own one with obtainer loaded, forkserver can
+        # not be shared with processes forked after it.
+        self.executor = MyProcessPoolExecutor(
+            self.concurrency,
+            initializer=preload_workers,
+            initargs=(
+                [__name__, self.obtainer.__name__],
+                self.worker_start_method,
+            ),
+        )
 
         # Check broken link first.
         broken_links = list(
@@ -212,11 +254,16 @@ class Collector:
             # Close db connection.
             config.db.close()
 
+            # Remove spill files.
+            self._close_storage()
+
             # Exit from the application.
             sys.exit()
 
         async def monitor():
-            while self.executor.get_pool_usage():
+            while self._in_flight or self._frontier:
+                self._check_memory()
+                self._schedule()
                 await asyncio.sleep(0.5)
 
         # Add a `start_url` as first request.
@@ -227,24 +274,69 @@ class Collector:
 
         # Wait until `executor` finished all tasks.
         asyncio.get_event_loop().run_until_complete(monitor())
-        log.info("Well done, %s URLs processed.", len(self.history))
+        self._check_memory()
+        log.info(
+            "Well done, %s URLs processed, peak RSS %sM.",
+            len(self.history),
+            round(self.peak_rss / 1024 / 1024, 2),
+        )
+        if self.memory_limit and self.peak_rss > self.memory_limit * 1024 * 1024:
+            log.warning(
+                "Peak RSS %sM exceeded memory limit %sM.",
+                round(self.peak_rss / 1024 / 1024, 2),
+                self.memory_limit,
+            )
+        self._close_storage()
+
+    def _close_storage(self):
+        self.history.close()
+        self._frontier.close()
+
+    def _check_memory(self):
+        "Track peak RSS and move in-memory structures to disk over the limit."
+        rss = psutil.Process().memory_info().rss
+        self.peak_rss = max(self.peak_rss, rss)
+        if (
+            self.memory_limit
+            and not self._memory_limited
+            and rss > self.memory_limit * 1024 * 1024
+        ):
+            # Freed memory is rarely returned to the OS, so RSS stays over the
+            # limit, spill only once and keep the containers small after.
+            log.info("Memory limit exceeded, moving history and queue to disk.")
+            self._memory_limited = True
+            self.history.limit(self.memory_limited_size)
+            self._frontier.limit(self.memory_limited_size)
 
     def _add_url(self, url, parent):
-        # Queue link process to execute.
-        future = asyncio.get_event_loop().run_in_executor(
-            self.executor,
-            func_proc,
-            self.obtainer.get_links,
-            self.obtainer_execution_timeout,
-            url,
-            parent,
-            self.useragent,
-        )
-        future.add_done_callback(self._furute_done_callback)
+        self.history.add(url)
+        self._frontier.append((url, parent))
+        self._schedule()
+
+    def _schedule(self):
+        # Submit only as many requests as the pool can run, so pending
+        # futures do not hold arguments of the whole frontier.
+        while self._frontier and self._in_flight < self.concurrency:
+            url, parent = self._frontier.popleft()
+            self._in_flight += 1
+            # Queue link process to execute.
+            future = asyncio.get_event_loop().run_in_executor(
+                self.executor,
+                func_proc,
+                self.obtainer.get_links,
+                self.obtainer_execution_timeout,
+                url,
+                parent,
+                self.useragent,
+            )
+            future.add_done_callback(self._furute_done_callback)
 
     def _furute_done_callback(self, future):
+        self._in_flight -= 1
+
         if future.exception():
             log.error(future.exception())
+            self._schedule()
             return
 
         result = future.result()
@@ -290,7 +382,7 @@ class Collector:
 
         message = (
             f"{process_name}: {response_code}, {round(response_size/1024/1024, 2)}M,"
-            f" {round(duration, 2)}s, {len(links)}, {self.executor.get_pool_usage()}, {url}"
+            f" {round(duration, 2)}s, {len(links)}, {self._in_flight}, {url}"
         )
 
         if response_code != 200:
@@ -310,8 +402,6 @@ class Collector:
             if link in self.history:
                 continue
 
-            self.history.add(link)
             self._add_url(link, url)
 
-        # Remove already done request from the list.
-        self.requests.remove(future)
+        self._schedule()
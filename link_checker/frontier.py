@@ -0,0 +1,187 @@
+import collections
+import json
+import os
+import sqlite3
+import tempfile
+
+
+class _SpillFile:
+    """Lazily created sqlite file used by the disk-backed containers to keep
+    items that do not fit into memory.
+    """
+
+    def __init__(self, spill_dir=None):
+        self._spill_dir = spill_dir
+        self._tmp_dir = None
+        self._db = None
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._tmp_dir = tempfile.TemporaryDirectory(
+                prefix="link_checker-", dir=self._spill_dir
+            )
+            path = os.path.join(self._tmp_dir.name, "spill.sqlite")
+            # Spill file is a scratch storage, durability is not required.
+            self._db = sqlite3.connect(path, isolation_level=None)
+            self._db.execute("pragma journal_mode = off")
+            self._db.execute("pragma synchronous = off")
+        return self._db
+
+    @property
+    def is_open(self):
+        return self._db is not None
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        if self._tmp_dir is not None:
+            self._tmp_dir.cleanup()
+            self._tmp_dir = None
+
+
+class DiskBackedSet:
+    """Set of strings kept in memory until it grows over `memory_size` items,
+    after that all items are moved into a sqlite file on disk.
+    """
+
+    def __init__(self, memory_size=1000000, spill_dir=None):
+        self.memory_size = memory_size
+        self._items = set()
+        self._disk_size = 0
+        self._spill = _SpillFile(spill_dir)
+
+    def __contains__(self, item):
+        if item in self._items:
+            return True
+        if not self._disk_size:
+            return False
+        row = self._spill.db.execute(
+            "select 1 from items where item = ?", (item,)
+        ).fetchone()
+        return row is not None
+
+    def __len__(self):
+        return len(self._items) + self._disk_size
+
+    def add(self, item):
+        # No membership check here, it is a disk lookup after spill, callers
+        # check it anyway; duplicates are ignored on spill.
+        self._items.add(item)
+        if len(self._items) > self.memory_size:
+            self.spill()
+
+    def spill(self):
+        "Move all in-memory items to disk."
+        if not self._items:
+            return
+        db = self._spill.db
+        db.execute("create table if not exists items (item text primary key)")
+        db.execute("begin")
+        changes = db.total_changes
+        db.executemany(
+            "insert or ignore into items values (?)", ((i,) for i in self._items)
+        )
+        self._disk_size += db.total_changes - changes
+        db.execute("commit")
+        self._items = set()
+
+    def limit(self, memory_size):
+        "Move all in-memory items to disk and keep at most `memory_size` after."
+        self.memory_size = memory_size
+        self.spill()
+
+    def close(self):
+        self._items = set()
+        self._disk_size = 0
+        self._spill.close()
+
+
+class DiskBackedQueue:
+    """FIFO queue of tuples of JSON-serialisable values kept in memory until it
+    grows over `memory_size` items, after that new items are appended to a
+    sqlite file on disk and read back in batches when the in-memory part is
+    exhausted.
+    """
+
+    def __init__(self, memory_size=100000, spill_dir=None):
+        self.memory_size = memory_size
+        self._items = collections.deque()
+        self._disk_size = 0
+        self._spill = _SpillFile(spill_dir)
+
+    def __len__(self):
+        return len(self._items) + self._disk_size
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def append(self, item):
+        # Keep FIFO order: once something is on disk, new items go after it.
+        if self._disk_size or len(self._items) >= self.memory_size:
+            self._write([item])
+        else:
+            self._items.append(item)
+
+    def popleft(self):
+        if not self._items and self._disk_size:
+            self._read(self.memory_size)
+        return self._items.popleft()
+
+    def spill(self):
+        "Move all in-memory items to disk."
+        if not self._items:
+            return
+        items = list(self._items)
+        self._items.clear()
+        if self._disk_size:
+            # Items in memory are older than those on disk, put them first.
+            self._write(items, head=True)
+        else:
+            self._write(items)
+
+    def limit(self, memory_size):
+        """Move all in-memory items to disk, keep at most `memory_size` items in
+        memory and read them back in batches of that size after.
+        """
+        self.memory_size = memory_size
+        self.spill()
+
+    def _table(self):
+        db = self._spill.db
+        db.execute(
+            "create table if not exists items (id integer primary key, item text)"
+        )
+        return db
+
+    def _write(self, items, head=False):
+        db = self._table()
+        start = 1
+        if head:
+            row = db.execute("select min(id) from items").fetchone()
+            start = (row[0] if row[0] is not None else 1) - len(items)
+        elif self._disk_size:
+            row = db.execute("select max(id) from items").fetchone()
+            start = (row[0] if row[0] is not None else 0) + 1
+        db.execute("begin")
+        db.executemany(
+            "insert into items values (?, ?)",
+            ((start + n, json.dumps(i)) for n, i in enumerate(items)),
+        )
+        db.execute("commit")
+        self._disk_size += len(items)
+
+    def _read(self, count):
+        db = self._spill.db
+        rows = db.execute(
+            "select id, item from items order by id limit ?", (max(count, 1),)
+        ).fetchall()
+        db.execute("delete from items where id <= ?", (rows[-1][0],))
+        self._disk_size -= len(rows)
+        self._items.extend(tuple(json.loads(item)) for _, item in rows)
+
+    def close(self):
+        self._items.clear()
+        self._disk_size = 0
+        self._spill.close()
@@ -42,9 +42,10 @@ class Link(peewee.Model):
         )
 
 
-# Ensure that model's table exists.
-try:
-    config.db.connect()
-    config.db.create_tables([Link])
-finally:
-    config.db.close()
+def migrate():
+    "Ensure that model's table exists."
+    try:
+        config.db.connect()
+        config.db.create_tables([Link])
+    finally:
+        config.db.close()
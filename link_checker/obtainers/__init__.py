@@ -1 +1,9 @@
-from . import pyppeteer
+import importlib
+
+_submodules = {"pyppeteer"}
+
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
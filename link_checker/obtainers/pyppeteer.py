@@ -8,6 +8,7 @@ from multiprocessing import current_process
 
 import pyppeteer
 import requests
+import urllib3
 from pyppeteer import errors, launch
 
 logging.basicConfig(level=logging.DEBUG)
@@ -16,6 +17,10 @@ logging.getLogger("websockets").setLevel(logging.ERROR)
 
 log = logging.getLogger(__name__)
 
+# Disable `InsecureRequestWarning: Unverified HTTPS request is being made.`
+# log warnings.
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
 is_url_regex = re.compile(
     r"^(?:http|ftp)s?://"  # http:// or https://
     r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|"  # domain...
@@ -43,11 +48,20 @@ async def _obtain_resources(url: str, parent_url: str, user_agent: str):
 
     start = time.time()
     headers = {"User-Agent": user_agent}
-    page = requests.get(url, verify=False, timeout=60, headers=headers)
+    page = requests.get(url, verify=False, timeout=60, headers=headers, stream=True)
 
     response_code = page.status_code
     response_reason = page.reason
-    response_size = len(page.content)
+
+    # Stream the body and discard it, only the size is needed here, the page
+    # itself is loaded by the browser below.
+    response_size = 0
+    try:
+        for chunk in page.iter_content(chunk_size=64 * 1024):
+            response_size += len(chunk)
+    finally:
+        page.close()
+
     response_content_type = (
         page.headers["content-type"] if "content-type" in page.headers else "unknown"
     )
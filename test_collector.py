@@ -0,0 +1,70 @@
+import multiprocessing
+import sys
+from multiprocessing import current_process
+
+import peewee
+import pytest
+
+from link_checker import collector, config, models
+
+START_URL = "http://example.com"
+PAGES = 60
+
+
+def get_links(url, parent, user_agent):
+    "Stub obtainer: page N links to pages 2N, 2N+1, start page and a foreign site."
+    page = int(url[len(START_URL) + 1 :] or 1)
+    links = [f"{START_URL}/{n}" for n in (page * 2, page * 2 + 1) if n < PAGES]
+    links += [START_URL, f"{url}#anchor", "http://foreign.com/1"]
+    return {
+        "url": url,
+        "parent_url": parent,
+        "duration": 0.0,
+        "response_code": 200,
+        "response_reason": "OK",
+        "response_size": 0,
+        "response_content_type": "text/html",
+        "links": links,
+        "process_name": current_process().name,
+    }
+
+
+class RecordingCollector(collector.Collector):
+    def __init__(self, url):
+        super().__init__(url)
+        self.processed = []
+
+    def _furute_done_callback(self, future):
+        if not future.exception():
+            self.processed.append(future.result()["url"])
+        super()._furute_done_callback(future)
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    database = peewee.SqliteDatabase(str(tmp_path / "links.sqlite"))
+    monkeypatch.setattr(config, "db", database)
+    with database.bind_ctx([models.Link]):
+        # Only the table, model indexes are MySQL specific.
+        database.connect()
+        models.Link._schema.create_table()
+        database.close()
+        yield database
+
+
+@pytest.mark.parametrize("start_method", multiprocessing.get_all_start_methods())
+def test_crawl_processes_each_url_once(db, tmp_path, start_method):
+    c = RecordingCollector(START_URL)
+    c.obtainer = sys.modules[__name__]
+    c.concurrency = 4
+    c.history_memory_size = 5
+    c.frontier_memory_size = 3
+    c.spill_dir = str(tmp_path)
+    c.worker_start_method = start_method
+    try:
+        c.start()
+    finally:
+        c.executor.shutdown()
+
+    expected = [START_URL] + [f"{START_URL}/{n}" for n in range(2, PAGES)]
+    assert sorted(c.processed) == sorted(expected)
@@ -0,0 +1,103 @@
+import collections
+import os
+import random
+
+import pytest
+
+from link_checker import frontier
+
+
+def test_queue_fifo_across_spill():
+    queue = frontier.DiskBackedQueue(memory_size=3)
+    expected = collections.deque()
+    rnd = random.Random(0)
+
+    for n in range(2000):
+        action = rnd.random()
+        if action < 0.5:
+            item = (f"http://example.com/{n}", "parent")
+            queue.append(item)
+            expected.append(item)
+        elif action < 0.9 and expected:
+            assert queue.popleft() == expected.popleft()
+        else:
+            queue.spill()
+        assert len(queue) == len(expected)
+        assert bool(queue) == bool(expected)
+
+    while expected:
+        assert queue.popleft() == expected.popleft()
+    assert not queue
+    queue.close()
+
+
+def test_queue_keeps_tuple_values():
+    queue = frontier.DiskBackedQueue(memory_size=1)
+    items = [("a\0b", ""), ("c", "d"), (1, "e")]
+    for item in items:
+        queue.append(item)
+    queue.spill()
+    assert [queue.popleft() for _ in items] == items
+    queue.close()
+
+
+def test_queue_popleft_empty():
+    queue = frontier.DiskBackedQueue(memory_size=1)
+    with pytest.raises(IndexError):
+        queue.popleft()
+
+
+def test_queue_limit():
+    queue = frontier.DiskBackedQueue(memory_size=100)
+    for n in range(50):
+        queue.append((str(n),))
+    queue.limit(5)
+    assert queue.popleft() == ("0",)
+    assert len(queue._items) == 4
+    assert [queue.popleft()[0] for _ in range(49)] == [str(n) for n in range(1, 50)]
+    queue.close()
+
+
+def test_set_across_spill():
+    history = frontier.DiskBackedSet(memory_size=3)
+    expected = set()
+    rnd = random.Random(0)
+
+    for _ in range(1000):
+        item = str(rnd.randrange(200))
+        if item not in history:
+            history.add(item)
+        expected.add(item)
+        assert len(history) == len(expected)
+
+    for n in range(300):
+        assert (str(n) in history) == (str(n) in expected)
+    history.close()
+
+
+def test_set_add_duplicate_after_spill():
+    history = frontier.DiskBackedSet(memory_size=1)
+    history.add("a")
+    history.spill()
+    history.add("a")
+    history.spill()
+    assert len(history) == 1
+    history.close()
+
+
+@pytest.mark.parametrize(
+    "container", [frontier.DiskBackedQueue, frontier.DiskBackedSet]
+)
+def test_close_removes_spill_dir(container, tmp_path):
+    storage = container(memory_size=1, spill_dir=str(tmp_path))
+    for n in range(5):
+        if container is frontier.DiskBackedQueue:
+            storage.append((str(n),))
+        else:
+            storage.add(str(n))
+    storage.spill()
+    assert os.listdir(tmp_path)
+
+    storage.close()
+    assert not os.listdir(tmp_path)
+    assert len(storage) == 0
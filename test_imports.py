@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+
+def run_python(code):
+    "Run the code in a new interpreter, return its stdout."
+    return subprocess.run(
+        [sys.executable, "-c", code], check=True, stdout=subprocess.PIPE
+    ).stdout.decode()
+
+
+def test_package_import_is_lazy():
+    output = run_python(
+        "import sys, link_checker, link_checker.obtainers\n"
+        "heavy = ['aiohttp', 'peewee', 'psutil', 'pyppeteer']\n"
+        "print([m for m in heavy if m in sys.modules])\n"
+    )
+    assert output.strip() == "[]"
+
+
+def test_models_import_does_not_connect():
+    output = run_python(
+        "import peewee\n"
+        "calls = []\n"
+        "peewee.Database.connect = lambda *args, **kwargs: calls.append(args)\n"
+        "import link_checker.models\n"
+        "print(len(calls))\n"
+    )
+    assert output.strip() == "0"